@@ -107,6 +107,23 @@ export default styled.div`
       background: ${theme.colors.grayscale.light5};
     }
 
+    .dt-hierarchy-button {
+      cursor: pointer;
+      margin-right: ${theme.gridUnit}px;
+      color: ${theme.colors.grayscale.base};
+    }
+    .dt-hierarchy-button.disabled {
+      cursor: default;
+      color: ${theme.colors.grayscale.light2};
+    }
+    .dt-hierarchy-pager {
+      margin-left: ${theme.gridUnit * 2}px;
+      white-space: nowrap;
+    }
+    .dt-hierarchy-pager .dt-hierarchy-button {
+      margin: 0 ${theme.gridUnit}px;
+    }
+
     .dt-no-results {
       text-align: center;
       padding: 1em 0.6em;
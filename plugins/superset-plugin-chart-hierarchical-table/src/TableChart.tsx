@@ -19,10 +19,12 @@
 import {
   CSSProperties,
   useCallback,
+  useEffect,
   useLayoutEffect,
   useMemo,
   useState,
   MouseEvent,
+  ReactNode,
 } from 'react';
 
 import {
@@ -56,14 +58,19 @@ import {
   CheckOutlined,
   InfoCircleOutlined,
   DownOutlined,
+  LeftOutlined,
   MinusCircleOutlined,
+  MinusSquareOutlined,
   PlusCircleOutlined,
+  PlusSquareOutlined,
+  RightOutlined,
   TableOutlined,
 } from '@ant-design/icons';
 import { isEmpty, isNumber } from 'lodash';
 import {
   ColorSchemeEnum,
   DataColumnMeta,
+  HierarchyRow,
   TableChartTransformedProps,
 } from './types';
 import DataTable, {
@@ -78,6 +85,7 @@ import { formatColumnValue } from './utils/formatValue';
 import { PAGE_SIZE_OPTIONS } from './consts';
 import { updateExternalFormData } from './DataTable/utils/externalAPIs';
 import getScrollBarSize from './DataTable/utils/getScrollBarSize';
+import { setHierarchyPage, toggleHierarchyRow } from './utils/hierarchy';
 
 type ValueRange = [number, number];
 
@@ -175,6 +183,43 @@ function SortIcon<D extends object>({ column }: { column: ColumnInstance<D> }) {
   return sortIcon;
 }
 
+function HierarchyButton({
+  label,
+  disabled = false,
+  onClick,
+  children,
+}: {
+  label: string;
+  disabled?: boolean;
+  onClick: () => void;
+  children: ReactNode;
+}) {
+  return (
+    <span
+      role="button"
+      aria-label={label}
+      aria-disabled={disabled}
+      className={cx('dt-hierarchy-button', { disabled })}
+      tabIndex={disabled ? -1 : 0}
+      onClick={e => {
+        // don't toggle cross filters of the cell
+        e.stopPropagation();
+        if (!disabled) {
+          onClick();
+        }
+      }}
+      onKeyDown={e => {
+        if (!disabled && Object.values(ACTION_KEYS).includes(e.key)) {
+          e.stopPropagation();
+          onClick();
+        }
+      }}
+    >
+      {children}
+    </span>
+  );
+}
+
 function SearchInput({ count, value, onChange }: SearchInputProps) {
   return (
     <span className="dt-global-filter">
@@ -263,6 +308,10 @@ export default function TableChart<D extends DataRecord = DataRecord>(
     isUsingTimeComparison,
     basicColorFormatters,
     basicColorColumnFormatters,
+    hierarchyLevels,
+    hierarchyRows,
+    hierarchyState,
+    hierarchyStatePruned,
   } = props;
   const comparisonColumns = [
     { key: 'all', label: t('Display all') },
@@ -393,6 +442,26 @@ export default function TableChart<D extends DataRecord = DataRecord>(
     [emitCrossFilters, getCrossFilterDataMask, setDataMask],
   );
 
+  const toggleHierarchy = useCallback(
+    function toggleHierarchy(row: HierarchyRow) {
+      setDataMask({ ownState: toggleHierarchyRow(hierarchyState, row) });
+    },
+    [hierarchyState, setDataMask],
+  );
+
+  useEffect(() => {
+    if (hierarchyStatePruned) {
+      setDataMask({ ownState: hierarchyState });
+    }
+  }, [hierarchyState, hierarchyStatePruned, setDataMask]);
+
+  const changeHierarchyPage = useCallback(
+    function changeHierarchyPage(row: HierarchyRow, page: number) {
+      setDataMask({ ownState: setHierarchyPage(hierarchyState, row, page) });
+    },
+    [hierarchyState, setDataMask],
+  );
+
   const getSharedStyle = (column: DataColumnMeta): CSSProperties => {
     const { isNumeric, config = {} } = column;
     const textAlign =
@@ -446,10 +515,15 @@ export default function TableChart<D extends DataRecord = DataRecord>(
           },
           clientX: number,
           clientY: number,
+          hierarchyRow?: HierarchyRow,
         ) => {
           const drillToDetailFilters: BinaryQueryObjectFilterClause[] = [];
           filteredColumnsMeta.forEach(col => {
-            if (!col.isMetric) {
+            // levels below a hierarchy row are not part of its group
+            const isBelowRow =
+              !!hierarchyRow &&
+              (hierarchyLevels?.indexOf(col.key) ?? -1) > hierarchyRow.depth;
+            if (!col.isMetric && !isBelowRow) {
               const dataRecordValue = value[col.key];
               drillToDetailFilters.push({
                 col: col.key,
@@ -700,6 +774,7 @@ export default function TableChart<D extends DataRecord = DataRecord>(
           : config.colorPositiveNegative;
 
       const { truncateLongCells } = config;
+      const hierarchyLevel = hierarchyLevels?.indexOf(key) ?? -1;
 
       const hasColumnColorFormatters =
         isNumeric &&
@@ -860,6 +935,7 @@ export default function TableChart<D extends DataRecord = DataRecord>(
                   { key, value, isMetric },
                   e.nativeEvent.clientX,
                   e.nativeEvent.clientY,
+                  hierarchyRows?.[row.index],
                 );
               }
             },
@@ -870,7 +946,64 @@ export default function TableChart<D extends DataRecord = DataRecord>(
             ].join(' '),
             tabIndex: 0,
           };
-          if (html) {
+
+          const hierarchyRow =
+            hierarchyLevel >= 0 ? hierarchyRows?.[row.index] : undefined;
+          if (hierarchyRow && hierarchyLevel !== hierarchyRow.depth) {
+            // a group value is only shown on the level its row belongs to
+            return <StyledCell {...cellProps} onClick={undefined} />;
+          }
+          let content: ReactNode = text;
+          if (hierarchyRow) {
+            const { isLeaf, isExpanded, page, hasNextPage } = hierarchyRow;
+            content = (
+              <>
+                {!isLeaf && (
+                  <HierarchyButton
+                    label={isExpanded ? t('Collapse') : t('Expand')}
+                    onClick={() => toggleHierarchy(hierarchyRow)}
+                  >
+                    {isExpanded ? (
+                      <MinusSquareOutlined />
+                    ) : (
+                      <PlusSquareOutlined />
+                    )}
+                  </HierarchyButton>
+                )}
+                {html ? (
+                  // eslint-disable-next-line react/no-danger
+                  <span dangerouslySetInnerHTML={html} />
+                ) : (
+                  text
+                )}
+                {isExpanded && (page > 0 || hasNextPage) && (
+                  <span className="dt-hierarchy-pager">
+                    <HierarchyButton
+                      label={t('table.previous_page')}
+                      disabled={page === 0}
+                      onClick={() =>
+                        changeHierarchyPage(hierarchyRow, page - 1)
+                      }
+                    >
+                      <LeftOutlined />
+                    </HierarchyButton>
+                    {page + 1}
+                    <HierarchyButton
+                      label={t('table.next_page')}
+                      disabled={!hasNextPage}
+                      onClick={() =>
+                        changeHierarchyPage(hierarchyRow, page + 1)
+                      }
+                    >
+                      <RightOutlined />
+                    </HierarchyButton>
+                  </span>
+                )}
+              </>
+            );
+          }
+
+          if (html && !hierarchyRow) {
             if (truncateLongCells) {
               // eslint-disable-next-line react/no-danger
               return (
@@ -907,12 +1040,12 @@ export default function TableChart<D extends DataRecord = DataRecord>(
                   style={columnWidth ? { width: columnWidth } : undefined}
                 >
                   {arrow && <span css={arrowStyles}>{arrow}</span>}
-                  {text}
+                  {content}
                 </div>
               ) : (
                 <>
                   {arrow && <span css={arrowStyles}>{arrow}</span>}
-                  {text}
+                  {content}
                 </>
               )}
             </StyledCell>
@@ -1013,6 +1146,10 @@ export default function TableChart<D extends DataRecord = DataRecord>(
       totals,
       columnColorFormatters,
       columnOrderToggle,
+      hierarchyLevels,
+      hierarchyRows,
+      toggleHierarchy,
+      changeHierarchyPage,
     ],
   );
 
@@ -1081,7 +1218,9 @@ export default function TableChart<D extends DataRecord = DataRecord>(
         // 9 page items in > 340px works well even for 100+ pages
         maxPageItemCount={width > 340 ? 9 : 7}
         noResults={getNoResultsMessage}
-        searchInput={includeSearch && SearchInput}
+        // a client-side search only sees the loaded rows, and would show
+        // matching children without their parent group
+        searchInput={includeSearch && !hierarchyRows && SearchInput}
         selectPageSize={pageSize !== null && SelectPageSize}
         // not in use in Superset, but needed for unit tests
         sticky={sticky}
@@ -1091,6 +1230,9 @@ export default function TableChart<D extends DataRecord = DataRecord>(
         renderTimeComparisonDropdown={
           isUsingTimeComparison ? renderTimeComparisonDropdown : undefined
         }
+        // rows are already ordered and paginated by the hierarchy queries
+        manualPagination={!!hierarchyRows}
+        disableSortBy={!!hierarchyRows}
       />
     </Styles>
   );
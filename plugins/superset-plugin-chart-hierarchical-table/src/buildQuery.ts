@@ -36,8 +36,15 @@ import {
   timeCompareOperator,
 } from '@superset-ui/chart-controls';
 import { isEmpty } from 'lodash';
-import { TableChartFormData } from './types';
+import { HierarchyOwnState, TableChartFormData } from './types';
 import { updateExternalFormData } from './DataTable/utils/externalAPIs';
+import {
+  getExpandedHierarchyPaths,
+  getHierarchyFilters,
+  getHierarchyKey,
+  getHierarchyLevels,
+  getHierarchyPageLength,
+} from './utils/hierarchy';
 
 /**
  * Infer query mode from form data. If `all_columns` is set, then raw records mode,
@@ -65,6 +72,8 @@ const buildQuery: BuildQuery<TableChartFormData> = (
     extra_form_data,
   } = formData;
   const queryMode = getQueryMode(formData);
+  const hierarchyLevelCount = getHierarchyLevels(formData, queryMode).length;
+  const isHierarchical = hierarchyLevelCount > 0;
   const sortByMetric = ensureIsArray(formData.timeseries_limit_metric)[0];
   const time_grain_sqla =
     extra_form_data?.time_grain_sqla || formData.time_grain_sqla;
@@ -127,6 +136,7 @@ const buildQuery: BuildQuery<TableChartFormData> = (
 
     let temporalColumnAdded = false;
     let temporalColumn = null;
+    let temporalColumnIndex = 0;
 
     if (queryMode === QueryMode.Aggregate) {
       metrics = metrics || [];
@@ -174,7 +184,7 @@ const buildQuery: BuildQuery<TableChartFormData> = (
       const temporalColumnsLookup = formData?.temporal_columns_lookup;
       // Filter out the column if needed and prepare the temporal column object
 
-      columns = columns.filter(col => {
+      columns = columns.filter((col, index) => {
         const shouldBeAdded =
           isPhysicalColumn(col) &&
           time_grain_sqla &&
@@ -189,13 +199,21 @@ const buildQuery: BuildQuery<TableChartFormData> = (
             expressionType: 'SQL',
           } as AdhocColumn;
           temporalColumnAdded = true;
+          temporalColumnIndex = index;
           return false; // Do not include this in the output; it's added separately
         }
         return true;
       });
 
-      // So we ensure the temporal column is added first
-      if (temporalColumn) {
+      // So we ensure the temporal column is added first, unless the columns
+      // are hierarchy levels, which must keep the order they were selected in
+      if (temporalColumn && isHierarchical) {
+        columns = [
+          ...columns.slice(0, temporalColumnIndex),
+          temporalColumn,
+          ...columns.slice(temporalColumnIndex),
+        ];
+      } else if (temporalColumn) {
         columns = [temporalColumn, ...columns];
       }
     }
@@ -267,9 +285,42 @@ const buildQuery: BuildQuery<TableChartFormData> = (
       ];
     }
 
+    // In hierarchy mode the main query only aggregates the top level, and each
+    // expanded node gets its own query grouped by one more level, so the
+    // database computes the subtotals and only visible rows are loaded.
+    const childQueries: QueryObject[] = [];
+    if (isHierarchical) {
+      const levelColumns = ensureIsArray(queryObject.columns);
+      const pageLength = getHierarchyPageLength(formData);
+      const hierarchyState = ownState as HierarchyOwnState;
+      getExpandedHierarchyPaths(hierarchyLevelCount, hierarchyState).forEach(
+        path => {
+          const page = hierarchyState.childPages?.[getHierarchyKey(path)] ?? 0;
+          childQueries.push({
+            ...queryObject,
+            columns: levelColumns.slice(0, path.length + 1),
+            filters: [
+              ...ensureIsArray(queryObject.filters),
+              ...getHierarchyFilters(levelColumns, path),
+            ],
+            // one extra row tells whether the node has a next page
+            row_limit: pageLength + 1,
+            row_offset: page * pageLength,
+            // a contribution would only cover the fetched page, percentages
+            // of child rows are computed against the parent record instead
+            post_processing: ensureIsArray(queryObject.post_processing).filter(
+              rule => rule?.operation !== 'contribution',
+            ),
+          });
+        },
+      );
+      queryObject = { ...queryObject, columns: levelColumns.slice(0, 1) };
+    }
+
     if (formData.server_pagination) {
       return [
         { ...queryObject },
+        ...childQueries,
         {
           ...queryObject,
           time_offsets: [],
@@ -282,7 +333,7 @@ const buildQuery: BuildQuery<TableChartFormData> = (
       ];
     }
 
-    return [queryObject, ...extraQueries];
+    return [queryObject, ...childQueries, ...extraQueries];
   });
 };
 
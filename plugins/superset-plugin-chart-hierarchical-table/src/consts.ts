@@ -30,3 +30,6 @@ export const PAGE_SIZE_OPTIONS = formatSelectOptions<number>([
   100,
   200,
 ]);
+
+// number of child rows loaded per page when expanding a hierarchy node
+export const HIERARCHY_PAGE_LENGTH = 50;
@@ -47,7 +47,7 @@ import {
 } from '@superset-ui/chart-controls';
 
 import { isEmpty } from 'lodash';
-import { PAGE_SIZE_OPTIONS } from './consts';
+import { HIERARCHY_PAGE_LENGTH, PAGE_SIZE_OPTIONS } from './consts';
 import { ColorSchemeEnum } from './types';
 
 function getQueryMode(controls: ControlStateMapping): QueryMode {
@@ -348,6 +348,36 @@ const config: ControlPanelConfig = {
             },
           },
         ],
+        [
+          {
+            name: 'hierarchy_pushdown',
+            config: {
+              type: 'CheckboxControl',
+              label: t('Server-side hierarchy'),
+              default: false,
+              description: t(
+                'Aggregate each level of the group by columns in the database and ' +
+                  'load the rows of a group only when it is expanded',
+              ),
+              visibility: isAggMode,
+              resetOnHide: false,
+            },
+          },
+          {
+            name: 'hierarchy_page_length',
+            config: {
+              type: 'SelectControl',
+              freeForm: true,
+              label: t('Rows per group'),
+              default: HIERARCHY_PAGE_LENGTH,
+              choices: PAGE_SIZE_OPTIONS.filter(([n]) => n > 0),
+              description: t('Rows loaded per page of an expanded group'),
+              visibility: ({ controls }: ControlPanelsContainerProps) =>
+                isAggMode({ controls }) &&
+                Boolean(controls?.hierarchy_pushdown?.value),
+            },
+          },
+        ],
         [
           {
             name: 'order_desc',
@@ -21,9 +21,11 @@ import {
   ComparisonType,
   CurrencyFormatter,
   DataRecord,
+  ChartDataResponseResult,
   ensureIsArray,
   extractTimegrain,
   GenericDataType,
+  getColumnLabel,
   getMetricLabel,
   getNumberFormatter,
   getTimeFormatter,
@@ -47,10 +49,21 @@ import {
 import { isEmpty } from 'lodash';
 import isEqualColumns from './utils/isEqualColumns';
 import DateWithFormatter from './utils/DateWithFormatter';
+import {
+  flattenHierarchy,
+  getExpandedHierarchyPaths,
+  getHierarchyChildCount,
+  getHierarchyLevels,
+  getHierarchyPageLength,
+  pruneHierarchyState,
+} from './utils/hierarchy';
+import { getQueryMode } from './buildQuery';
 import {
   BasicColorFormatterType,
   ColorSchemeEnum,
   DataColumnMeta,
+  HierarchyOwnState,
+  TableChartFormData,
   TableChartProps,
   TableChartTransformedProps,
 } from './types';
@@ -190,6 +203,7 @@ const processComparisonDataRecords = memoizeOne(
 
 const processColumns = memoizeOne(function processColumns(
   props: TableChartProps,
+  queryResult: ChartDataResponseResult | undefined,
 ) {
   const {
     datasource: { columnFormats, currencyFormats, verboseMap },
@@ -199,10 +213,9 @@ const processColumns = memoizeOne(function processColumns(
       percent_metrics: percentMetrics_,
       column_config: columnConfig = {},
     },
-    queriesData,
   } = props;
   const granularity = extractTimegrain(props.rawFormData);
-  const { data: records, colnames, coltypes } = queriesData[0] || {};
+  const { data: records, colnames, coltypes } = queryResult || {};
   // convert `metrics` and `percentMetrics` to the key names in `data.records`
   const metrics = (metrics_ ?? []).map(getMetricLabel);
   const rawPercentMetrics = (percentMetrics_ ?? []).map(getMetricLabel);
@@ -347,6 +360,66 @@ const processComparisonColumns = (
     })
     .flat();
 
+/**
+ * Split the results of the hierarchy queries and merge them into a single
+ * result, with a column for every level so they all get a column meta.
+ */
+const processHierarchyQueries = memoizeOne(function processHierarchyQueries(
+  queriesData: ChartDataResponseResult[],
+  formData: TableChartFormData,
+  ownState: HierarchyOwnState | undefined,
+) {
+  const levels = getHierarchyLevels(formData, getQueryMode(formData)).map(
+    getColumnLabel,
+  );
+  const childCount = getHierarchyChildCount(queriesData, formData);
+  const [baseQuery] = queriesData;
+  const childQueries = queriesData.slice(1, childCount + 1);
+  // child rows need the same percent columns the top level contribution
+  // produced, including the `%metric__<offset>` ones of a time comparison
+  const percentMetrics = ensureIsArray(formData.percent_metrics).map(
+    getMetricLabel,
+  );
+  const percentColumns = (baseQuery?.colnames || [])
+    .filter(key =>
+      percentMetrics.some(
+        metric => key === `%${metric}` || key.startsWith(`%${metric}__`),
+      ),
+    )
+    .map(key => key.slice(1));
+  const { data, rows } = flattenHierarchy(
+    baseQuery?.data,
+    childQueries,
+    levels,
+    ownState,
+    getHierarchyPageLength(formData),
+    percentColumns,
+  );
+  // while a refetch is pending the results are from the previous own state
+  const isSettled =
+    getExpandedHierarchyPaths(levels.length, ownState).length === childCount;
+  const results = [baseQuery, ...childQueries].filter(Boolean);
+  const colnames = [
+    ...levels,
+    ...(baseQuery?.colnames || []).filter(key => !levels.includes(key)),
+  ];
+  const coltypes = colnames.map(key => {
+    const result = results.find(query => query.colnames?.includes(key));
+    return result
+      ? result.coltypes[result.colnames.indexOf(key)]
+      : GenericDataType.String;
+  });
+  return {
+    levels,
+    rows,
+    prunedState: isSettled ? pruneHierarchyState(ownState, rows) : undefined,
+    queriesData: [
+      { ...baseQuery, colnames, coltypes, data },
+      ...queriesData.slice(childCount + 1),
+    ],
+  };
+});
+
 /**
  * Automatically set page size based on number of cells.
  */
@@ -558,7 +631,20 @@ const transformProps = (
     ? ensureIsArray(timeOffsets)[0]
     : '';
 
-  const [metrics, percentMetrics, columns] = processColumns(chartProps);
+  const hierarchy =
+    getHierarchyLevels(formData, getQueryMode(formData)).length > 0
+      ? processHierarchyQueries(
+          queriesData,
+          formData,
+          serverPaginationData as HierarchyOwnState | undefined,
+        )
+      : undefined;
+  const resultsData = hierarchy?.queriesData ?? queriesData;
+
+  const [metrics, percentMetrics, columns] = processColumns(
+    chartProps,
+    resultsData[0],
+  );
   let comparisonColumns: DataColumnMeta[] = [];
   if (isUsingTimeComparison) {
     comparisonColumns = processComparisonColumns(
@@ -573,10 +659,10 @@ const transformProps = (
   let totalQuery;
   let rowCount;
   if (serverPagination) {
-    [baseQuery, countQuery, totalQuery] = queriesData;
+    [baseQuery, countQuery, totalQuery] = resultsData;
     rowCount = (countQuery?.data?.[0]?.rowcount as number) ?? 0;
   } else {
-    [baseQuery, totalQuery] = queriesData;
+    [baseQuery, totalQuery] = resultsData;
     rowCount = baseQuery?.rowcount ?? 0;
   }
   const data = processDataRecords(baseQuery?.data, columns);
@@ -628,9 +714,12 @@ const transformProps = (
     sortDesc,
     includeSearch,
     rowCount,
+    // client-side pagination would split the loaded children from their parent
     pageSize: serverPagination
       ? serverPageLength
-      : getPageSize(pageLength, data.length, columns.length),
+      : hierarchy
+        ? 0
+        : getPageSize(pageLength, data.length, columns.length),
     filters: filterState.filters,
     emitCrossFilters,
     onChangeFilter,
@@ -643,6 +732,12 @@ const transformProps = (
     basicColorFormatters,
     startDateOffset,
     basicColorColumnFormatters,
+    hierarchyLevels: hierarchy?.levels,
+    hierarchyRows: hierarchy?.rows,
+    hierarchyState:
+      hierarchy?.prunedState ??
+      (serverPaginationData as HierarchyOwnState | undefined),
+    hierarchyStatePruned: !!hierarchy?.prunedState,
   };
 };
 
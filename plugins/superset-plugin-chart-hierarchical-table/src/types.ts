@@ -91,8 +91,35 @@ export type TableChartFormData = QueryFormData & {
   time_grain_sqla?: TimeGranularity;
   column_config?: Record<string, TableColumnConfig>;
   allow_rearrange_columns?: boolean;
+  hierarchy_pushdown?: boolean;
+  hierarchy_page_length?: string | number | null;
 };
 
+/**
+ * Values of the group by columns leading to a node of the hierarchy, from the
+ * top level down. Kept as raw query values so they can be sent back as filters.
+ */
+export type HierarchyPath = (string | number | boolean | null)[];
+
+export type HierarchyOwnState = {
+  pageSize?: number;
+  currentPage?: number;
+  expandedRows?: HierarchyPath[];
+  // page of the children of each expanded node, keyed by `getHierarchyKey`
+  childPages?: Record<string, number>;
+};
+
+export interface HierarchyRow {
+  key: string;
+  path: HierarchyPath;
+  depth: number;
+  isLeaf: boolean;
+  isExpanded: boolean;
+  // pagination of the loaded children, only meaningful when expanded
+  page: number;
+  hasNextPage: boolean;
+}
+
 export interface TableChartProps extends ChartProps {
   ownCurrentState?: {
     pageSize?: number;
@@ -146,6 +173,11 @@ export interface TableChartTransformedProps<D extends DataRecord = DataRecord> {
   basicColorFormatters?: { [Key: string]: BasicColorFormatterType }[];
   basicColorColumnFormatters?: { [Key: string]: BasicColorFormatterType }[];
   startDateOffset?: string;
+  hierarchyLevels?: string[];
+  hierarchyRows?: HierarchyRow[];
+  hierarchyState?: HierarchyOwnState;
+  // `hierarchyState` dropped expanded rows that are no longer rendered
+  hierarchyStatePruned?: boolean;
 }
 
 export enum ColorSchemeEnum {
@@ -0,0 +1,296 @@
+/**
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+import {
+  ChartDataResponseResult,
+  DataRecord,
+  ensureIsArray,
+  getColumnLabel,
+  isAdhocColumn,
+  QueryFormColumn,
+  QueryMode,
+  QueryObjectFilterClause,
+  removeDuplicates,
+  TimeGranularity,
+} from '@superset-ui/core';
+import { HIERARCHY_PAGE_LENGTH } from '../consts';
+import {
+  HierarchyOwnState,
+  HierarchyPath,
+  HierarchyRow,
+  TableChartFormData,
+} from '../types';
+
+/**
+ * Columns making up the levels of the hierarchy, top level first. Empty when
+ * the chart is not rendered as a server-side hierarchy.
+ *
+ * The same logic is used in `buildQuery` and `transformProps`, so the queries
+ * and their results can be matched by position.
+ */
+export function getHierarchyLevels(
+  formData: TableChartFormData,
+  queryMode: QueryMode,
+): QueryFormColumn[] {
+  if (!formData.hierarchy_pushdown || queryMode !== QueryMode.Aggregate) {
+    return [];
+  }
+  const levels = removeDuplicates(
+    [
+      ...(ensureIsArray(formData.groupby) as QueryFormColumn[]),
+      ...ensureIsArray(formData.extra_form_data?.interactive_groupby),
+    ],
+    getColumnLabel,
+  );
+  // a single level is a plain table, no need to split the queries
+  return levels.length > 1 ? levels : [];
+}
+
+export function getHierarchyPageLength(formData: TableChartFormData) {
+  return Number(formData.hierarchy_page_length) || HIERARCHY_PAGE_LENGTH;
+}
+
+export const getHierarchyKey = (path: HierarchyPath) => JSON.stringify(path);
+
+/**
+ * Expanded nodes that need their children loaded, in the order they were
+ * expanded. Nodes below a collapsed parent or at the deepest level are
+ * dropped, so every returned path maps to exactly one child query.
+ */
+export function getExpandedHierarchyPaths(
+  levelCount: number,
+  ownState: HierarchyOwnState = {},
+): HierarchyPath[] {
+  const expandedRows = ensureIsArray(ownState.expandedRows).filter(
+    path =>
+      Array.isArray(path) && path.length > 0 && path.length < levelCount,
+  );
+  const expandedKeys = new Set(expandedRows.map(getHierarchyKey));
+  const seen = new Set<string>();
+  return expandedRows.filter(path => {
+    const key = getHierarchyKey(path);
+    if (seen.has(key)) {
+      return false;
+    }
+    seen.add(key);
+    return path.every(
+      (_, i) => i === 0 || expandedKeys.has(getHierarchyKey(path.slice(0, i))),
+    );
+  });
+}
+
+/**
+ * Filters restricting a query to the descendants of the node at `path`.
+ *
+ * A temporal level is grouped by a time grained adhoc column, whose values
+ * the backend can't convert back from epoch. Those filter on the physical
+ * column with the same grain instead, as cross filters on time columns do.
+ */
+export function getHierarchyFilters(
+  columns: QueryFormColumn[],
+  path: HierarchyPath,
+): QueryObjectFilterClause[] {
+  return path.map((val, i) => {
+    const column = columns[i];
+    const isTimeGrained =
+      isAdhocColumn(column) &&
+      column.columnType === 'BASE_AXIS' &&
+      !!column.timeGrain;
+    const filter = isTimeGrained
+      ? {
+          col: column.sqlExpression,
+          grain: column.timeGrain as TimeGranularity,
+        }
+      : { col: column };
+    return val === null || val === undefined
+      ? { ...filter, op: 'IS NULL' as const }
+      : { ...filter, op: '==' as const, val };
+  });
+}
+
+/**
+ * Number of child results in `queriesData`, derived from the shape of the
+ * response rather than the current own state, which may already have changed
+ * while these results were fetched with the previous one.
+ */
+export function getHierarchyChildCount(
+  queriesData: unknown[],
+  formData: TableChartFormData,
+) {
+  const hasTotals =
+    !!formData.show_totals &&
+    (ensureIsArray(formData.metrics).length > 0 ||
+      ensureIsArray(formData.percent_metrics).length > 0);
+  const extraCount = (formData.server_pagination ? 1 : 0) + (hasTotals ? 1 : 0);
+  return Math.max(queriesData.length - 1 - extraCount, 0);
+}
+
+/**
+ * Merge the top level records and the children loaded for expanded nodes into
+ * a single list in display order, along with the position of every record in
+ * the hierarchy. Children are attached to their parent by the values of the
+ * ancestor levels every child record carries.
+ *
+ * Percent metrics of child records are their share of the parent record.
+ */
+export function flattenHierarchy(
+  records: DataRecord[] = [],
+  childResults: Pick<ChartDataResponseResult, 'colnames' | 'data'>[],
+  levels: string[],
+  ownState: HierarchyOwnState = {},
+  pageLength: number = HIERARCHY_PAGE_LENGTH,
+  percentMetrics: string[] = [],
+) {
+  const getPath = (record: DataRecord, depth: number) =>
+    levels
+      .slice(0, depth + 1)
+      .map(level => record[level] as HierarchyPath[number]);
+
+  const children = new Map<string, DataRecord[]>();
+  childResults.forEach(({ colnames, data: childRecords }) => {
+    const depth = levels.filter(level => colnames?.includes(level)).length - 1;
+    if (depth < 1) {
+      return;
+    }
+    ensureIsArray(childRecords).forEach(record => {
+      const parentKey = getHierarchyKey(getPath(record, depth - 1));
+      children.set(parentKey, [...(children.get(parentKey) || []), record]);
+    });
+  });
+  const withShareOf = (record: DataRecord, parent: DataRecord) => {
+    const shares: DataRecord = {};
+    percentMetrics.forEach(metric => {
+      const value = record[metric];
+      const total = parent[metric];
+      shares[`%${metric}`] =
+        typeof value === 'number' && typeof total === 'number' && total !== 0
+          ? value / total
+          : null;
+    });
+    return { ...record, ...shares };
+  };
+  const data: DataRecord[] = [];
+  const rows: HierarchyRow[] = [];
+
+  const addLevel = (levelRecords: DataRecord[], depth: number) => {
+    levelRecords.forEach(record => {
+      const path = getPath(record, depth);
+      const key = getHierarchyKey(path);
+      // child queries fetch one extra row to tell whether there is a next page
+      const nodeChildren = children.get(key);
+      data.push(record);
+      rows.push({
+        key,
+        path,
+        depth,
+        isLeaf: depth === levels.length - 1,
+        isExpanded: !!nodeChildren,
+        page: ownState.childPages?.[key] ?? 0,
+        hasNextPage: (nodeChildren?.length ?? 0) > pageLength,
+      });
+      if (nodeChildren) {
+        addLevel(
+          nodeChildren.slice(0, pageLength).map(child =>
+            percentMetrics.length > 0 ? withShareOf(child, record) : child,
+          ),
+          depth + 1,
+        );
+      }
+    });
+  };
+  addLevel(records, 0);
+
+  return { data, rows };
+}
+
+/**
+ * Drop the expanded nodes that are no longer rendered, e.g. after dashboard
+ * filters changed, so they stop sending a child query on every refresh. The
+ * user can't collapse them, as their rows are gone. Returns `undefined` when
+ * there is nothing to prune.
+ *
+ * Only call it once the results match the own state, a node that was just
+ * expanded is not rendered with its children until they are fetched.
+ */
+export function pruneHierarchyState(
+  ownState: HierarchyOwnState = {},
+  rows: HierarchyRow[],
+): HierarchyOwnState | undefined {
+  const renderedKeys = new Set(rows.map(row => row.key));
+  const expandedRows = ensureIsArray(ownState.expandedRows);
+  const keptRows = expandedRows.filter(path =>
+    renderedKeys.has(getHierarchyKey(path)),
+  );
+  if (keptRows.length === expandedRows.length) {
+    return undefined;
+  }
+  const keptKeys = new Set(keptRows.map(getHierarchyKey));
+  return {
+    ...ownState,
+    expandedRows: keptRows,
+    childPages: Object.fromEntries(
+      Object.entries(ownState.childPages || {}).filter(([key]) =>
+        keptKeys.has(key),
+      ),
+    ),
+  };
+}
+
+/**
+ * Expand a collapsed node or collapse an expanded one together with all of its
+ * descendants.
+ *
+ * A node may render collapsed while still in `expandedRows`, when the page of
+ * children it is on came back empty, e.g. after a dashboard filter shrank the
+ * group. Expanding it starts over from its first page instead.
+ */
+export function toggleHierarchyRow(
+  ownState: HierarchyOwnState = {},
+  row: HierarchyRow,
+): HierarchyOwnState {
+  const expandedRows = ensureIsArray(ownState.expandedRows);
+  const isDescendant = (path: HierarchyPath) =>
+    getHierarchyKey(path.slice(0, row.path.length)) === row.key;
+  const childPages = { ...ownState.childPages };
+  expandedRows.filter(isDescendant).forEach(path => {
+    delete childPages[getHierarchyKey(path)];
+  });
+  const collapsedRows = expandedRows.filter(path => !isDescendant(path));
+  return {
+    ...ownState,
+    expandedRows: row.isExpanded ? collapsedRows : [...collapsedRows, row.path],
+    childPages,
+  };
+}
+
+/**
+ * Move to another page of the children of an expanded node. Descendants
+ * expanded on the previous page are collapsed, as they are no longer visible.
+ */
+export function setHierarchyPage(
+  ownState: HierarchyOwnState = {},
+  row: HierarchyRow,
+  page: number,
+): HierarchyOwnState {
+  const collapsed = toggleHierarchyRow(ownState, { ...row, isExpanded: true });
+  return {
+    ...collapsed,
+    expandedRows: [...ensureIsArray(collapsed.expandedRows), row.path],
+    childPages: { ...collapsed.childPages, [row.key]: page },
+  };
+}
@@ -16,15 +16,14 @@
  * specific language governing permissions and limitations
  * under the License.
  */
-import { isEqualArray } from '@superset-ui/core';
+import { ChartDataResponseResult, isEqualArray } from '@superset-ui/core';
 import { TableChartProps } from '../types';
 
-export default function isEqualColumns(
-  propsA: TableChartProps[],
-  propsB: TableChartProps[],
-) {
-  const a = propsA[0];
-  const b = propsB[0];
+type ColumnsArgs = [TableChartProps, ChartDataResponseResult | undefined];
+
+export default function isEqualColumns(propsA: unknown[], propsB: unknown[]) {
+  const [a, queryA] = propsA as ColumnsArgs;
+  const [b, queryB] = propsB as ColumnsArgs;
   return (
     a.datasource.columnFormats === b.datasource.columnFormats &&
     a.datasource.currencyFormats === b.datasource.currencyFormats &&
@@ -34,8 +33,8 @@ export default function isEqualColumns(
     JSON.stringify(a.formData.columnConfig || null) ===
       JSON.stringify(b.formData.columnConfig || null) &&
     isEqualArray(a.formData.metrics, b.formData.metrics) &&
-    isEqualArray(a.queriesData?.[0]?.colnames, b.queriesData?.[0]?.colnames) &&
-    isEqualArray(a.queriesData?.[0]?.coltypes, b.queriesData?.[0]?.coltypes) &&
+    isEqualArray(queryA?.colnames, queryB?.colnames) &&
+    isEqualArray(queryA?.coltypes, queryB?.coltypes) &&
     JSON.stringify(a.formData.extraFilters || null) ===
       JSON.stringify(b.formData.extraFilters || null) &&
     JSON.stringify(a.formData.extraFormData || null) ===
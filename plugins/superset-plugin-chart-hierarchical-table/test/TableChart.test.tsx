@@ -17,7 +17,7 @@
  * under the License.
  */
 import { CommonWrapper } from 'enzyme';
-import { render, screen } from '@testing-library/react';
+import { fireEvent, render, screen } from '@testing-library/react';
 import '@testing-library/jest-dom';
 import TableChart from '../src/TableChart';
 import transformProps from '../src/transformProps';
@@ -65,6 +65,130 @@ describe('plugin-chart-table', () => {
       expect(String(parsedDate)).toBe('2020-01-01 12:34:56');
       expect(parsedDate.getTime()).toBe(1577882096000);
     });
+
+    it('should nest loaded children under their parent', () => {
+      const { data, columns, hierarchyRows, pageSize } = transformProps(
+        testData.hierarchy,
+      );
+      expect(columns.map(col => col.key)).toEqual([
+        'group_id',
+        'responsible_id',
+        'count',
+      ]);
+      expect(data.map(row => row.responsible_id)).toEqual([
+        undefined,
+        7,
+        undefined,
+      ]);
+      expect(hierarchyRows?.map(row => row.depth)).toEqual([0, 1, 0]);
+      expect(hierarchyRows?.[0]).toMatchObject({
+        path: ['g1'],
+        isExpanded: true,
+        hasNextPage: true,
+      });
+      expect(hierarchyRows?.[1]).toMatchObject({
+        path: ['g1', 7],
+        isLeaf: true,
+      });
+      expect(pageSize).toBe(0);
+    });
+
+    it('should prune expanded rows that are no longer rendered', () => {
+      const [baseQuery, childQuery] = testData.hierarchy.queriesData;
+      const props = transformProps({
+        ...testData.hierarchy,
+        ownState: { expandedRows: [['gone']], childPages: { '["gone"]': 1 } },
+        queriesData: [baseQuery, { ...childQuery, data: [] }],
+      });
+      expect(props.hierarchyStatePruned).toBe(true);
+      expect(props.hierarchyState).toEqual({
+        expandedRows: [],
+        childPages: {},
+      });
+      // results of a pending refetch are not pruned against
+      expect(
+        transformProps({
+          ...testData.hierarchy,
+          ownState: { expandedRows: [['g1'], ['g2']] },
+        }).hierarchyStatePruned,
+      ).toBe(false);
+    });
+
+    it('should compute time comparison percentages of children', () => {
+      const [baseQuery, childQuery] = testData.hierarchy.queriesData;
+      const { data } = transformProps({
+        ...testData.hierarchy,
+        rawFormData: {
+          ...testData.hierarchy.rawFormData,
+          percent_metrics: ['count'],
+        },
+        queriesData: [
+          {
+            ...baseQuery,
+            colnames: [
+              'group_id',
+              'count',
+              'count__1 year ago',
+              '%count',
+              '%count__1 year ago',
+            ],
+            data: [
+              { group_id: 'g1', count: 3, 'count__1 year ago': 4 },
+              { group_id: 'g2', count: 1, 'count__1 year ago': 0 },
+            ],
+          },
+          {
+            ...childQuery,
+            data: [
+              {
+                group_id: 'g1',
+                responsible_id: 7,
+                count: 2,
+                'count__1 year ago': 1,
+              },
+            ],
+          },
+        ],
+      });
+      expect(data[1]['%count__1 year ago']).toBe(0.25);
+      expect(data[1]['%count']).toBeCloseTo(2 / 3);
+    });
+
+    it('should memoize hierarchy records and columns meta', () => {
+      const props = transformProps(testData.hierarchy);
+      const nextProps = transformProps({ ...testData.hierarchy });
+      expect(nextProps.data).toBe(props.data);
+      expect(nextProps.columns).toBe(props.columns);
+    });
+
+    it('should match hierarchy results by their shape, not the own state', () => {
+      const totals = {
+        ...testData.hierarchy.queriesData[0],
+        colnames: ['count'],
+        data: [{ count: 4 }],
+      };
+      const withTotals = {
+        ...testData.hierarchy,
+        rawFormData: { ...testData.hierarchy.rawFormData, show_totals: true },
+        queriesData: [...testData.hierarchy.queriesData, totals],
+      };
+      // the row was collapsed, but the results are still the previous ones
+      const collapsed = transformProps({ ...withTotals, ownState: {} });
+      expect(collapsed.totals).toEqual({ count: 4 });
+      expect(collapsed.hierarchyRows?.map(row => row.depth)).toEqual([
+        0, 1, 0,
+      ]);
+      // a row was expanded, but its children are not fetched yet
+      const expanded = transformProps({
+        ...withTotals,
+        ownState: { expandedRows: [['g1'], ['g2']] },
+      });
+      expect(expanded.totals).toEqual({ count: 4 });
+      expect(expanded.hierarchyRows?.[2]).toMatchObject({
+        path: ['g2'],
+        isExpanded: false,
+      });
+    });
   });
 
   describe('TableChart', () => {
@@ -90,6 +214,67 @@ describe('plugin-chart-table', () => {
       expect(cells.eq(8).text()).toEqual('N/A');
     });
 
+    it('render hierarchy', () => {
+      wrap = mount(
+        <TableChart {...transformProps(testData.hierarchy)} sticky={false} />,
+      );
+      tree = wrap.render();
+      const cells = tree.find('td');
+      expect(cells).toHaveLength(9);
+      expect(cells.eq(2).text()).toEqual('3');
+      // ancestor values are not repeated on child rows
+      expect(cells.eq(3).text()).toEqual('');
+      expect(cells.eq(4).text()).toEqual('7');
+      // toggles for both groups and the pager of the expanded one
+      expect(tree.find('.dt-hierarchy-button')).toHaveLength(4);
+      expect(tree.find('.dt-hierarchy-pager').text()).toEqual('1');
+    });
+
+    it('render hierarchy without the client-side search box', () => {
+      wrap = mount(
+        <TableChart
+          {...transformProps({
+            ...testData.hierarchy,
+            rawFormData: {
+              ...testData.hierarchy.rawFormData,
+              include_search: true,
+            },
+          })}
+          sticky={false}
+        />,
+      );
+      tree = wrap.render();
+      expect(tree.find('.dt-global-filter')).toHaveLength(0);
+    });
+
+    it('should update own state when toggling a hierarchy row', () => {
+      const setDataMask = jest.fn();
+      render(
+        ProviderWrapper({
+          children: (
+            <TableChart
+              {...transformProps(testData.hierarchy)}
+              setDataMask={setDataMask}
+              sticky={false}
+            />
+          ),
+        }),
+      );
+      fireEvent.click(screen.getByRole('button', { name: 'Expand' }));
+      expect(setDataMask).toHaveBeenLastCalledWith({
+        ownState: { expandedRows: [['g1'], ['g2']], childPages: {} },
+      });
+      fireEvent.click(screen.getByRole('button', { name: 'Collapse' }));
+      expect(setDataMask).toHaveBeenLastCalledWith({
+        ownState: { expandedRows: [], childPages: {} },
+      });
+      fireEvent.click(screen.getByRole('button', { name: 'Next' }));
+      expect(setDataMask).toHaveBeenLastCalledWith({
+        ownState: { expandedRows: [['g1']], childPages: { '["g1"]': 1 } },
+      });
+      expect(setDataMask).toHaveBeenCalledTimes(3);
+    });
+
     it('render advanced data', () => {
       wrap = mount(
         <TableChart {...transformProps(testData.advanced)} sticky={false} />,
@@ -158,4 +158,119 @@ describe('plugin-chart-table', () => {
       expect(queries[1].extras?.where).toEqual("(status IN ('In Process'))");
     });
   });
+
+  describe('buildQuery with server-side hierarchy', () => {
+    const hierarchyFormData: TableChartFormData = {
+      ...basicFormData,
+      query_mode: QueryMode.Aggregate,
+      groupby: ['group_id', 'responsible_id', 'status'],
+      metrics: ['count'],
+      hierarchy_pushdown: true,
+      hierarchy_page_length: 10,
+    };
+
+    it('should only group the main query by the top level', () => {
+      const { queries } = buildQuery(hierarchyFormData);
+      expect(queries).toHaveLength(1);
+      expect(queries[0].columns).toEqual(['group_id']);
+    });
+
+    it('should add a paginated query for every expanded row', () => {
+      const { queries } = buildQuery(hierarchyFormData, {
+        ownState: {
+          expandedRows: [[1], [1, null]],
+          childPages: { '[1]': 2 },
+        },
+      });
+      expect(queries).toHaveLength(3);
+      expect(queries[1].columns).toEqual(['group_id', 'responsible_id']);
+      expect(queries[1].filters).toContainEqual({
+        col: 'group_id',
+        op: '==',
+        val: 1,
+      });
+      expect(queries[1].row_limit).toEqual(11);
+      expect(queries[1].row_offset).toEqual(20);
+      expect(queries[2].columns).toEqual([
+        'group_id',
+        'responsible_id',
+        'status',
+      ]);
+      expect(queries[2].filters).toContainEqual({
+        col: 'responsible_id',
+        op: 'IS NULL',
+      });
+      expect(queries[2].row_offset).toEqual(0);
+    });
+
+    it('should only compute percent metrics contribution on the top level', () => {
+      const { queries } = buildQuery(
+        { ...hierarchyFormData, percent_metrics: ['count'] },
+        { ownState: { expandedRows: [[1]] } },
+      );
+      expect(queries[0].post_processing).toEqual([
+        {
+          operation: 'contribution',
+          options: {
+            columns: ['count'],
+            rename_columns: ['%count'],
+          },
+        },
+      ]);
+      expect(queries[1].post_processing).toEqual([]);
+    });
+
+    it('should filter temporal levels on the physical column and grain', () => {
+      const { queries } = buildQuery(
+        {
+          ...hierarchyFormData,
+          groupby: ['created_date', 'status'],
+          time_grain_sqla: TimeGranularity.MONTH,
+          temporal_columns_lookup: { created_date: true },
+        },
+        { ownState: { expandedRows: [[1577836800000]] } },
+      );
+      expect(queries[1].columns?.[0]).toMatchObject({
+        sqlExpression: 'created_date',
+        timeGrain: TimeGranularity.MONTH,
+      });
+      expect(queries[1].columns?.[1]).toEqual('status');
+      expect(queries[1].filters).toContainEqual({
+        col: 'created_date',
+        grain: TimeGranularity.MONTH,
+        op: '==',
+        val: 1577836800000,
+      });
+    });
+
+    it('should skip rows expanded under a collapsed parent', () => {
+      const { queries } = buildQuery(hierarchyFormData, {
+        ownState: { expandedRows: [[1, 'u1'], [1, 'u1', 'done']] },
+      });
+      expect(queries).toHaveLength(1);
+    });
+
+    it('should place children before the count and totals queries', () => {
+      const { queries } = buildQuery(
+        { ...hierarchyFormData, show_totals: true, server_pagination: true },
+        { ownState: { expandedRows: [[1], [2]] } },
+      );
+      expect(queries).toHaveLength(5);
+      expect(queries[0].columns).toEqual(['group_id']);
+      expect(queries[1].columns).toEqual(['group_id', 'responsible_id']);
+      expect(queries[2].columns).toEqual(['group_id', 'responsible_id']);
+      expect(queries[3].is_rowcount).toBe(true);
+      expect(queries[3].columns).toEqual(['group_id']);
+      expect(queries[4].columns).toEqual([]);
+    });
+
+    it('should keep the totals query last', () => {
+      const { queries } = buildQuery(
+        { ...hierarchyFormData, show_totals: true },
+        { ownState: { expandedRows: [[1]] } },
+      );
+      expect(queries).toHaveLength(3);
+      expect(queries[2].columns).toEqual([]);
+    });
+  });
 });
@@ -0,0 +1,240 @@
+/**
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+import { QueryMode } from '@superset-ui/core';
+import {
+  flattenHierarchy,
+  getExpandedHierarchyPaths,
+  getHierarchyChildCount,
+  getHierarchyFilters,
+  getHierarchyLevels,
+  pruneHierarchyState,
+  setHierarchyPage,
+  toggleHierarchyRow,
+} from '../src/utils/hierarchy';
+import { HierarchyRow, TableChartFormData } from '../src/types';
+
+const formData: TableChartFormData = {
+  viz_type: 'table',
+  datasource: '11__table',
+  groupby: ['group_id', 'responsible_id'],
+  metrics: ['count'],
+  hierarchy_pushdown: true,
+};
+
+const expandedRow: HierarchyRow = {
+  key: '["g1"]',
+  path: ['g1'],
+  depth: 0,
+  isLeaf: false,
+  isExpanded: true,
+  page: 1,
+  hasNextPage: false,
+};
+
+const levels = ['group_id', 'responsible_id'];
+const records = [
+  { group_id: 'g1', count: 4, '%count': 0.8 },
+  { group_id: 'g2', count: 1, '%count': 0.2 },
+];
+const childResults = [
+  {
+    colnames: ['group_id', 'responsible_id', 'count'],
+    data: [
+      { group_id: 'g1', responsible_id: 7, count: 3 },
+      { group_id: 'g1', responsible_id: 8, count: 1 },
+    ],
+  },
+];
+
+describe('utils/hierarchy', () => {
+  describe('getHierarchyLevels', () => {
+    it('should only be enabled with several group by columns', () => {
+      expect(getHierarchyLevels(formData, QueryMode.Aggregate)).toEqual([
+        'group_id',
+        'responsible_id',
+      ]);
+      expect(getHierarchyLevels(formData, QueryMode.Raw)).toEqual([]);
+      expect(
+        getHierarchyLevels(
+          { ...formData, groupby: ['group_id'] },
+          QueryMode.Aggregate,
+        ),
+      ).toEqual([]);
+      expect(
+        getHierarchyLevels(
+          { ...formData, hierarchy_pushdown: false },
+          QueryMode.Aggregate,
+        ),
+      ).toEqual([]);
+    });
+  });
+
+  describe('getExpandedHierarchyPaths', () => {
+    it('should drop duplicates, leaves and rows of collapsed parents', () => {
+      expect(
+        getExpandedHierarchyPaths(3, {
+          expandedRows: [[1], [1], [1, 'u1'], [2, 'u2'], [1, 'u1', 'done']],
+        }),
+      ).toEqual([[1], [1, 'u1']]);
+    });
+  });
+
+  describe('getHierarchyFilters', () => {
+    it('should filter null values with IS NULL', () => {
+      expect(getHierarchyFilters(['a', 'b'], ['x', null])).toEqual([
+        { col: 'a', op: '==', val: 'x' },
+        { col: 'b', op: 'IS NULL' },
+      ]);
+    });
+  });
+
+  describe('getHierarchyChildCount', () => {
+    it('should count the results between the base and extra queries', () => {
+      expect(getHierarchyChildCount([1, 2, 3], formData)).toBe(2);
+      expect(
+        getHierarchyChildCount([1, 2, 3, 4, 5], {
+          ...formData,
+          show_totals: true,
+          server_pagination: true,
+        }),
+      ).toBe(2);
+      expect(getHierarchyChildCount([1], formData)).toBe(0);
+    });
+  });
+
+  describe('flattenHierarchy', () => {
+    it('should compute percent metrics of children against their parent', () => {
+      const { data } = flattenHierarchy(
+        records,
+        childResults,
+        levels,
+        {},
+        10,
+        ['count'],
+      );
+      expect(data.map(record => record['%count'])).toEqual([
+        0.8, 0.75, 0.25, 0.2,
+      ]);
+    });
+
+    it('should attach children by their ancestor values', () => {
+      const { data, rows } = flattenHierarchy(
+        records,
+        // results are not in the order of the top level records
+        [
+          {
+            colnames: ['group_id', 'responsible_id', 'count'],
+            data: [{ group_id: 'g2', responsible_id: 9, count: 1 }],
+          },
+          ...childResults,
+        ],
+        levels,
+        { childPages: { '["g1"]': 1 } },
+        1,
+      );
+      expect(data.map(record => record.responsible_id)).toEqual([
+        undefined,
+        7,
+        undefined,
+        9,
+      ]);
+      expect(rows.map(row => row.key)).toEqual([
+        '["g1"]',
+        '["g1",7]',
+        '["g2"]',
+        '["g2",9]',
+      ]);
+      expect(rows[0]).toMatchObject({ page: 1, hasNextPage: true });
+      expect(rows[2]).toMatchObject({ page: 0, hasNextPage: false });
+      expect(rows[1]).toMatchObject({ depth: 1, isLeaf: true });
+    });
+  });
+
+  describe('toggleHierarchyRow', () => {
+    it('should expand a collapsed row', () => {
+      expect(
+        toggleHierarchyRow(
+          { currentPage: 2 },
+          { ...expandedRow, isExpanded: false },
+        ),
+      ).toEqual({ currentPage: 2, expandedRows: [['g1']], childPages: {} });
+    });
+
+    it('should restart from the first page a row left on an empty page', () => {
+      // the row is still expanded in the own state, but rendered collapsed as
+      // its current page of children came back empty
+      expect(
+        toggleHierarchyRow(
+          {
+            expandedRows: [['g1'], ['g1', 7]],
+            childPages: { '["g1"]': 3, '["g1",7]': 1 },
+          },
+          { ...expandedRow, isExpanded: false },
+        ),
+      ).toEqual({ expandedRows: [['g1']], childPages: {} });
+    });
+
+    it('should collapse a row with its descendants and their pages', () => {
+      expect(
+        toggleHierarchyRow(
+          {
+            expandedRows: [['g1'], ['g1', 7], ['g2']],
+            childPages: { '["g1"]': 1, '["g1",7]': 2, '["g2"]': 3 },
+          },
+          expandedRow,
+        ),
+      ).toEqual({
+        expandedRows: [['g2']],
+        childPages: { '["g2"]': 3 },
+      });
+    });
+  });
+
+  describe('setHierarchyPage', () => {
+    it('should change the page and collapse the descendants', () => {
+      expect(
+        setHierarchyPage(
+          {
+            expandedRows: [['g1'], ['g1', 7], ['g2']],
+            childPages: { '["g1"]': 1, '["g1",7]': 2 },
+          },
+          expandedRow,
+          2,
+        ),
+      ).toEqual({
+        expandedRows: [['g2'], ['g1']],
+        childPages: { '["g1"]': 2 },
+      });
+    });
+  });
+
+  describe('pruneHierarchyState', () => {
+    it('should drop expanded rows that are not rendered', () => {
+      expect(
+        pruneHierarchyState(
+          { expandedRows: [['g1'], ['g3']], childPages: { '["g3"]': 1 } },
+          [expandedRow],
+        ),
+      ).toEqual({ expandedRows: [['g1']], childPages: {} });
+      expect(
+        pruneHierarchyState({ expandedRows: [['g1']] }, [expandedRow]),
+      ).toBeUndefined();
+    });
+  });
+});
@@ -222,10 +222,54 @@ const empty = {
   ],
 };
 
+/**
+ * Server-side hierarchy with the first group expanded and a next page of
+ * children available
+ */
+const hierarchy: TableChartProps = {
+  ...basic,
+  rawFormData: {
+    ...basicFormData,
+    query_mode: QueryMode.Aggregate,
+    groupby: ['group_id', 'responsible_id'],
+    metrics: ['count'],
+    hierarchy_pushdown: true,
+    hierarchy_page_length: 1,
+  },
+  ownState: {
+    expandedRows: [['g1']],
+  },
+  queriesData: [
+    {
+      ...basicQueryResult,
+      colnames: ['group_id', 'count'],
+      coltypes: [GenericDataType.String, GenericDataType.Numeric],
+      data: [
+        { group_id: 'g1', count: 3 },
+        { group_id: 'g2', count: 1 },
+      ],
+    },
+    {
+      ...basicQueryResult,
+      colnames: ['group_id', 'responsible_id', 'count'],
+      coltypes: [
+        GenericDataType.String,
+        GenericDataType.Numeric,
+        GenericDataType.Numeric,
+      ],
+      data: [
+        { group_id: 'g1', responsible_id: 7, count: 2 },
+        { group_id: 'g1', responsible_id: 8, count: 1 },
+      ],
+    },
+  ],
+};
+
 export default {
   basic,
   advanced,
   advancedWithCurrency,
   empty,
   raw,
+  hierarchy,
 };